@@ -3,8 +3,14 @@
 #
 
 import argparse
+import binascii
+import functools
+import io
+import itertools
+import re
 import sys
 import tempfile
+from pathlib import Path
 from lxml import etree
 import subprocess
 import struct
@@ -26,6 +32,11 @@ categorys = {
     51: "rxpdo",
     60: "dclock",
 }
+categorys_order = {cat_type: pos for pos, cat_type in enumerate(categorys)}
+# xmlWrite() order: fmmu, syncm and the pdos (rx first) before general
+categorys_xml_order = {
+    cat_type: pos for pos, cat_type in enumerate((0, 10, 20, 40, 41, 51, 50, 30, 60))
+}
 
 datatypes = {
     0x00: "UNDEF",
@@ -53,6 +64,56 @@ datatypes = {
     0x1B: "UINT64",
 }
 
+datatype_ids = {name: dtype for dtype, name in datatypes.items()}
+
+xml_true = frozenset(("true", "1"))
+
+physics_ports = {
+    "Y": 0x01,  # MII
+    "K": 0x03,  # EBUS
+}
+physics_chars = {port: char for char, port in physics_ports.items()}
+
+fmmu_usages = {
+    "Outputs": 0x01,
+    "Inputs": 0x02,
+    "MBoxState": 0x03,
+}
+fmmu_usage_names = {usage: name for name, usage in fmmu_usages.items()}
+
+syncm_types = {
+    "MBoxOut": 1,
+    "MBoxIn": 2,
+    "Outputs": 3,
+    "Inputs": 4,
+}
+syncm_type_names = {sm_type: name for name, sm_type in syncm_types.items()}
+
+# PDO attribute -> bit in txpdo/rxpdo flags
+pdo_flags = {
+    "Mandatory": 0x01,
+    "Fixed": 0x10,
+    "Virtual": 0x20,
+    "OverwrittenByModule": 0x80,
+}
+
+# Mailbox child -> bit in stdconfig.mailbox_protocol
+mailbox_protocols = {
+    "CoE": 0x04,
+    "EoE": 0x02,
+    "FoE": 0x08,
+    "VoE": 0x20,
+}
+
+# CoE attribute -> bit in general.coe_details (bit 0: SDO enabled)
+coe_details_bits = (
+    ("SdoInfo", 1),
+    ("PdoAssign", 2),
+    ("PdoConfig", 3),
+    ("PdoUpload", 4),
+    ("CompleteAccess", 5),
+)
+
 lcidinfo = {
     "1031": "German (Germany)",
     "1033": "English (United States)",
@@ -77,11 +138,108 @@ lcidinfo = {
     "4100": "Chinese (Singapore)",
 }
 
+structs = {
+    1: struct.Struct("<B"),
+    2: struct.Struct("<H"),
+    4: struct.Struct("<I"),
+}
+
+
+@functools.cache
+def xpath_compile(xpath):
+    return etree.XPath(xpath, smart_strings=False)
+
+
+@functools.lru_cache(maxsize=256)
+def datatype_id(datatype):
+    datatype = (
+        datatype.replace("UINT16", "UINT")
+        .replace("UINT8", "UINT")
+        .replace("UINT32", "UINT")
+    )
+    return datatype_ids.get(datatype, 0)
+
+
+@functools.lru_cache(maxsize=4096)
+def xml_int(value):
+    value = value.strip()
+    if value.startswith("#x"):
+        return int(value.replace("#x", "0x"), 0)
+    elif value == "true":
+        return 1
+    elif value == "false":
+        return 0
+    return int(value)
+
+
+# Intel-HEX record: byte count, address, type, data, checksum
+hex_record = re.compile(rb"^\s*:((?:[0-9A-Fa-f]{2})+)\s*$", re.MULTILINE)
+
+# ImageData hex dumps may be wrapped over several lines
+hex_whitespace = str.maketrans("", "", " \t\r\n")
+
+# size is the number of hex digits, not bytes
+value2xml_formats = {
+    2: "#x{:02X}",
+    4: "#x{:04X}",
+    8: "#x{:08X}",
+}
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def value2xml(value, size=0):
+    fmt = value2xml_formats.get(size)
+    if fmt is None:
+        return str(value)
+    return fmt.format(value)
+
+
+@functools.lru_cache(maxsize=256)
+def value2xml_datatype(value):
+    return str(datatypes.get(value, value))
+
+
+def crc8_calc(value):
+    for i in range(8):
+        if value & 0x80:
+            value = ((value << 1) ^ 0x07) & 0xFF
+        else:
+            value = (value << 1) & 0xFF
+    return value
+
+
+crc8_table = bytes(crc8_calc(value) for value in range(256))
+
+
+def crc8(bindata, crc=0xFF):
+    table = crc8_table
+    for byte in bindata:
+        crc = table[crc ^ byte]
+    return crc
+
 
 class Base:
+    __slots__ = (
+        "bindata",
+        "debug",
+        "device_info",
+        "deviceid",
+        "deviceids",
+        "images",
+        "lcid",
+        "lcids",
+        "offset",
+        "parent",
+        "startpos",
+        "strings",
+        "strings_index",
+        "xml_root",
+    )
+
     def __init__(self, parent):
         self.parent = parent
         self.strings = parent.strings
+        self.strings_index = parent.strings_index
         self.xml_root = parent.xml_root
         self.lcid = parent.lcid
         self.lcids = parent.lcids
@@ -94,66 +252,51 @@ class Base:
         self.offset = 0
         self.startpos = 0
 
+    @property
+    def xml_device(self):
+        # looked up on use, the device is only selected while parsing
+        return self.parent.xml_device
+
     def bytes2ee(self, value):
         return (value - 0x80) >> 7
 
     def binVarRead(self, bindata, size):
-        if size == 2:
-            vtype = "H"
-        elif size == 4:
-            vtype = "I"
-        else:
-            vtype = "B"
-        value = struct.unpack(f"<{vtype}", bindata[self.offset : self.offset + size])[0]
+        (value,) = structs[size].unpack_from(bindata, self.offset)
         self.offset += size
         return value
 
     def binVarWrite(self, value, size):
-        if size == 2:
-            vtype = "H"
-        elif size == 4:
-            vtype = "I"
-        else:
-            vtype = "B"
-        bindata = struct.pack(f"<{vtype}", value)
         self.offset += size
-        return bindata
+        return structs[size].pack(value)
 
     def stringSet(self, text):
         text = str(text)
-        if text not in self.parent.strings:
+        string_index = self.parent.strings_index.get(text)
+        if string_index is None:
+            string_index = len(self.parent.strings)
             self.parent.strings.append(text)
-        string_index = self.parent.strings.index(text)
+            self.parent.strings_index[text] = string_index
         return string_index
 
     def datatypeSet(self, datatype):
-        dlist = list(datatypes.values())
-        datatype = (
-            datatype.replace("UINT16", "UINT")
-            .replace("UINT8", "UINT")
-            .replace("UINT32", "UINT")
-        )
-        if datatype in dlist:
-            datatype_index = dlist.index(datatype)
-            return datatype_index
-        return 0
+        return datatype_id(datatype)
 
     def printKeyDatatype(self, key, value, prefix=""):
         datatype = datatypes.get(value, "UNSET")
-        return [f"{prefix}   {key:30} {value:6d} ({datatype})"]
+        return f"{prefix}   {key:30} {value:6d} ({datatype})"
 
     def printKeyString(self, key, value, prefix=""):
         if value < len(self.parent.strings):
             text = self.parent.strings[value]
-            return [f"{prefix}   {key:30} '{text}'"]
+            return f"{prefix}   {key:30} '{text}'"
         else:
-            return [f"{prefix}   {key:30} {value:6d}"]
+            return f"{prefix}   {key:30} {value:6d}"
 
     def printKeyValue(self, key, value, prefix="", fmt=None):
         if isinstance(value, int):
-            return [f"{prefix}   {key:30} 0x{value:04x} ({value})"]
+            return f"{prefix}   {key:30} 0x{value:04x} ({value})"
         else:
-            return [f"{prefix}   {key:30} {value:6s}"]
+            return f"{prefix}   {key:30} {value:6s}"
 
     def value2xmlText(self, value):
         if value < len(self.parent.strings):
@@ -167,17 +310,10 @@ class Base:
         return "false"
 
     def value2xmlDatatype(self, value):
-        value = datatypes.get(value, value)
-        return str(value)
+        return value2xml_datatype(value)
 
     def value2xml(self, value, size=0):
-        if size == 2:
-            return f"#x{value:02X}"
-        elif size == 4:
-            return f"#x{value:04X}"
-        elif size == 8:
-            return f"#x{value:08X}"
-        return str(value)
+        return value2xml(value, size)
 
     def xml_value_parse(self, value):
         if isinstance(value, str):
@@ -190,16 +326,39 @@ class Base:
                 value = 0
         return value
 
+    def xml_int(self, value):
+        if isinstance(value, str):
+            return xml_int(value)
+        return int(value)
+
+    def xml_findall(self, base_element, xpath):
+        if base_element is None:
+            return []
+        return xpath_compile(xpath)(base_element)
+
+    def xml_find(self, base_element, xpath):
+        if base_element is None:
+            return None
+        result = xpath_compile(xpath)(base_element)
+        if result:
+            return result[0]
+        return None
+
+    def xml_device_children(self, tag):
+        if self.xml_device is None:
+            return []
+        return self.xml_device.iterchildren(tag)
+
     def xml_value(self, base_element, xpath, attribute=None, default=0):
         values = []
-        result = base_element.findall(xpath)
+        result = self.xml_findall(base_element, xpath)
         if result is not None and result:
             for element in result:
                 lcId = element.get("LcId")
-                if lcId and lcId not in self.lcids:
-                    self.lcids.append(lcId)
-                if lcId and self.lcid and lcId != self.lcid:
-                    continue
+                if lcId:
+                    self.lcids.add(lcId)
+                    if self.lcid and lcId != self.lcid:
+                        continue
                 if attribute:
                     value = element.get(attribute, default)
                 else:
@@ -210,53 +369,56 @@ class Base:
 
 
 class preamble(Base):
-    def crc8byte(self, crc, b):
-        crc = crc ^ b
-        for i in range(8):
-            if (crc & 0x80) == 0x80:
-                crc = (crc << 1) ^ 0x07
-            else:
-                crc <<= 1
-        while crc > 255:
-            crc -= 256
-        return crc
+    layout = struct.Struct(
+        "<"
+        "H"  # 0 pdi_ctrl
+        "H"  # 2 pdi_conf
+        "H"  # 4 sync_impulse
+        "H"  # 6 pdi_conf2
+        "H"  # 8 alias
+        "I"  # 10 reserved1
+    )
+    # Eeprom/ConfigData holds the first five words
+    config_layout = struct.Struct("<5H")
 
     def csum(self, bindata):
-        crc = 255
-        for byte in bindata:
-            crc = self.crc8byte(crc, byte)
-        return crc
+        return crc8(bindata)
 
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.pdi_ctrl = self.binVarRead(bindata, 2)  # 0
-        self.pdi_conf = self.binVarRead(bindata, 2)  # 2
-        self.sync_impulse = self.binVarRead(bindata, 2)  # 4
-        self.pdi_conf2 = self.binVarRead(bindata, 2)  # 6
-        self.alias = self.binVarRead(bindata, 2)  # 8
-        self.reserved1 = self.binVarRead(bindata, 4)  # 10
+        (
+            self.pdi_ctrl,
+            self.pdi_conf,
+            self.sync_impulse,
+            self.pdi_conf2,
+            self.alias,
+            self.reserved1,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         self.checksum = self.binVarRead(bindata, 2)  # 14
         if self.offset != self.size():
             print("SIZE ERROR:", self, self.offset, self.size())
 
         crc = self.csum(bindata[:14])
-        if crc != self.checksum:
-            self.checksum_ok = True
+        self.checksum_ok = crc == self.checksum
+        if not self.checksum_ok:
             print("CSUM ERROR:", crc, self.checksum)
 
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.pdi_ctrl, 2)  # 0
-        bindata += self.binVarWrite(self.pdi_conf, 2)  # 2
-        bindata += self.binVarWrite(self.sync_impulse, 2)  # 4
-        bindata += self.binVarWrite(self.pdi_conf2, 2)  # 6
-        bindata += self.binVarWrite(self.alias, 2)  # 8
-        bindata += self.binVarWrite(self.reserved1, 4)  # 10
-        self.checksum = self.csum(bindata[:14])
+        bindata = bytearray(
+            self.layout.pack(
+                self.pdi_ctrl,
+                self.pdi_conf,
+                self.sync_impulse,
+                self.pdi_conf2,
+                self.alias,
+                self.reserved1,
+            )
+        )
+        self.checksum = self.csum(bindata)  # the 14 layout bytes
         bindata += self.binVarWrite(self.checksum, 2)  # 14
         return bindata
 
@@ -272,104 +434,126 @@ class preamble(Base):
         self.reserved1 = 0
         self.checksum = 0
 
-        configDataElement = base_element.find(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Eeprom/ConfigData"
-        )
+        configDataElement = self.xml_find(self.xml_device, "./Eeprom/ConfigData")
         if configDataElement is not None:
             configData = bytearray.fromhex(configDataElement.text)
-            cpos = 0
-            if len(configData) >= cpos + 2:
-                self.pdi_ctrl = struct.unpack("<H", configData[cpos : cpos + 2])[0]
-            cpos += 2
-            if len(configData) >= cpos + 2:
-                self.pdi_conf = struct.unpack("<H", configData[cpos : cpos + 2])[0]
-            cpos += 2
-            if len(configData) >= cpos + 2:
-                self.sync_impulse = struct.unpack("<H", configData[cpos : cpos + 2])[0]
-            cpos += 2
-            if len(configData) >= cpos + 2:
-                self.pdi_conf2 = struct.unpack("<H", configData[cpos : cpos + 2])[0]
-            cpos += 2
-            if len(configData) >= cpos + 2:
-                self.alias = struct.unpack("<H", configData[cpos : cpos + 2])[0]
-            cpos += 2
+            # ConfigData may be shorter than the 5 words, missing ones stay 0
+            words = min(len(configData) // 2, 5)
+            values = struct.unpack_from(f"<{words}H", configData)
+            values += (0,) * (5 - words)
+            (
+                self.pdi_ctrl,
+                self.pdi_conf,
+                self.sync_impulse,
+                self.pdi_conf2,
+                self.alias,
+            ) = values
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
+        )
         Eeprom = etree.SubElement(Device, "Eeprom")
         etree.SubElement(Eeprom, "ByteSize").text = "2048"
         ConfigData = etree.SubElement(Eeprom, "ConfigData")
-        blist = []
-        blist += struct.pack("<H", self.pdi_ctrl)
-        blist += struct.pack("<H", self.pdi_conf)
-        blist += struct.pack("<H", self.sync_impulse)
-        blist += struct.pack("<H", self.pdi_conf2)
-        blist += struct.pack("<H", self.alias)
-        ConfigData.text = "".join([f"{b:02x}" for b in list(blist)])
+        blist = self.config_layout.pack(
+            self.pdi_ctrl,
+            self.pdi_conf,
+            self.sync_impulse,
+            self.pdi_conf2,
+            self.alias,
+        )
+        ConfigData.text = blist.hex()
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}preamble: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("pdi_ctrl", self.pdi_ctrl, prefix)
-        output += self.printKeyValue("pdi_conf", self.pdi_conf, prefix)
-        output += self.printKeyValue("sync_impulse", self.sync_impulse, prefix)
-        output += self.printKeyValue("pdi_conf2", self.pdi_conf2, prefix)
-        output += self.printKeyValue("alias", self.alias, prefix)
-        output += self.printKeyValue("checksum", self.checksum, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("pdi_ctrl", self.pdi_ctrl, prefix))
+        output.append(self.printKeyValue("pdi_conf", self.pdi_conf, prefix))
+        output.append(self.printKeyValue("sync_impulse", self.sync_impulse, prefix))
+        output.append(self.printKeyValue("pdi_conf2", self.pdi_conf2, prefix))
+        output.append(self.printKeyValue("alias", self.alias, prefix))
+        output.append(self.printKeyValue("checksum", self.checksum, prefix))
         output.append("")
         return output
 
 
 class stdconfig(Base):
+    layout = struct.Struct(
+        "<"
+        "I"  # 0 vendor_id
+        "I"  # 4 product_id
+        "I"  # 8 revision_id
+        "I"  # 12 serial
+        "8x"  # 16
+        "H"  # 24 bs_rec_mbox_offset
+        "H"  # 26 bs_rec_mbox_size
+        "H"  # 28 bs_snd_mbox_offset
+        "H"  # 30 bs_snd_mbox_size
+        "H"  # 32 std_rec_mbox_offset
+        "H"  # 34 std_rec_mbox_size
+        "H"  # 36 std_snd_mbox_offset
+        "H"  # 38 std_snd_mbox_size
+        "H"  # 40 mailbox_protocol
+        "66x"  # 42
+        "H"  # 108 eeprom_size
+        "H"  # 110 version
+    )
+    # Eeprom/BootStrap holds the four bootstrap mailbox words
+    bootstrap_layout = struct.Struct("<4H")
+
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.vendor_id = self.binVarRead(bindata, 4)  # 0
-        self.product_id = self.binVarRead(bindata, 4)  # 4
-        self.revision_id = self.binVarRead(bindata, 4)  # 8
-        self.serial = self.binVarRead(bindata, 4)  # 12
-        self.offset += 8  # 16
-        self.bs_rec_mbox_offset = self.binVarRead(bindata, 2)  # 24
-        self.bs_rec_mbox_size = self.binVarRead(bindata, 2)  # 26
-        self.bs_snd_mbox_offset = self.binVarRead(bindata, 2)  # 28
-        self.bs_snd_mbox_size = self.binVarRead(bindata, 2)  # 30
-        self.std_rec_mbox_offset = self.binVarRead(bindata, 2)  # 32
-        self.std_rec_mbox_size = self.binVarRead(bindata, 2)  # 34
-        self.std_snd_mbox_offset = self.binVarRead(bindata, 2)  # 36
-        self.std_snd_mbox_size = self.binVarRead(bindata, 2)  # 38
-        self.mailbox_protocol = self.binVarRead(bindata, 2)  # 40
-        self.offset += 66  # 42
-        self.eeprom_size = self.binVarRead(bindata, 2)  # 108
-        self.version = self.binVarRead(bindata, 2)  # 110
+        (
+            self.vendor_id,
+            self.product_id,
+            self.revision_id,
+            self.serial,
+            self.bs_rec_mbox_offset,
+            self.bs_rec_mbox_size,
+            self.bs_snd_mbox_offset,
+            self.bs_snd_mbox_size,
+            self.std_rec_mbox_offset,
+            self.std_rec_mbox_size,
+            self.std_snd_mbox_offset,
+            self.std_snd_mbox_size,
+            self.mailbox_protocol,
+            self.eeprom_size,
+            self.version,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         if self.offset != self.size():
-            output.append("SIZE ERROR:", self, self.offset, self.size())
+            print("SIZE ERROR:", self, self.offset, self.size())
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.vendor_id, 4)  # 0
-        bindata += self.binVarWrite(self.product_id, 4)  # 4
-        bindata += self.binVarWrite(self.revision_id, 4)  # 8
-        bindata += self.binVarWrite(self.serial, 4)  # 12
-        bindata += [0] * 8  # 16
-        bindata += self.binVarWrite(self.bs_rec_mbox_offset, 2)  # 24
-        bindata += self.binVarWrite(self.bs_rec_mbox_size, 2)  # 26
-        bindata += self.binVarWrite(self.bs_snd_mbox_offset, 2)  # 28
-        bindata += self.binVarWrite(self.bs_snd_mbox_size, 2)  # 30
-        bindata += self.binVarWrite(self.std_rec_mbox_offset, 2)  # 32
-        bindata += self.binVarWrite(self.std_rec_mbox_size, 2)  # 34
-        bindata += self.binVarWrite(self.std_snd_mbox_offset, 2)  # 36
-        bindata += self.binVarWrite(self.std_snd_mbox_size, 2)  # 38
-        bindata += self.binVarWrite(self.mailbox_protocol, 2)  # 40
-        bindata += [0] * 66  # 42
-        bindata += self.binVarWrite(self.eeprom_size, 2)  # 108
-        bindata += self.binVarWrite(self.version, 2)  # 110
+        bindata = bytearray(
+            self.layout.pack(
+                self.vendor_id,
+                self.product_id,
+                self.revision_id,
+                self.serial,
+                self.bs_rec_mbox_offset,
+                self.bs_rec_mbox_size,
+                self.bs_snd_mbox_offset,
+                self.bs_snd_mbox_size,
+                self.std_rec_mbox_offset,
+                self.std_rec_mbox_size,
+                self.std_snd_mbox_offset,
+                self.std_snd_mbox_size,
+                self.mailbox_protocol,
+                self.eeprom_size,
+                self.version,
+            )
+        )
         return bindata
 
     def size(self):
@@ -378,18 +562,10 @@ class stdconfig(Base):
     def xmlRead(self, base_element):
         self.vendor_id = int(self.xml_value(base_element, "./Vendor/Id")[0])
         self.product_id = int(
-            self.xml_value(
-                base_element,
-                f"./Descriptions/Devices/Device[{self.deviceid}]/Type",
-                "ProductCode",
-            )[0]
+            self.xml_value(self.xml_device, "./Type", "ProductCode")[0]
         )
         self.revision_id = int(
-            self.xml_value(
-                base_element,
-                f"./Descriptions/Devices/Device[{self.deviceid}]/Type",
-                "RevisionNo",
-            )[0]
+            self.xml_value(self.xml_device, "./Type", "RevisionNo")[0]
         )
         self.serial = 0
         self.bs_rec_mbox_offset = 0
@@ -404,213 +580,208 @@ class stdconfig(Base):
         self.eeprom_size = 0
         self.version = 1
 
-        for sm in base_element.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Sm"
-        ):
+        for sm in self.xml_device_children("Sm"):
             name = sm.text
             if name == "MBoxOut":
-                self.std_rec_mbox_size = int(
-                    self.xml_value_parse(sm.get("DefaultSize", 0))
-                )
-                self.std_rec_mbox_offset = int(
-                    self.xml_value_parse(sm.get("StartAddress", 0))
-                )
+                self.std_rec_mbox_size = self.xml_int(sm.get("DefaultSize", 0))
+                self.std_rec_mbox_offset = self.xml_int(sm.get("StartAddress", 0))
             if name == "MBoxIn":
-                self.std_snd_mbox_size = int(
-                    self.xml_value_parse(sm.get("DefaultSize", 0))
-                )
-                self.std_snd_mbox_offset = int(
-                    self.xml_value_parse(sm.get("StartAddress", 0))
-                )
+                self.std_snd_mbox_size = self.xml_int(sm.get("DefaultSize", 0))
+                self.std_snd_mbox_offset = self.xml_int(sm.get("StartAddress", 0))
 
-        eeprom_size = int(
-            self.xml_value(
-                base_element,
-                f"./Descriptions/Devices/Device[{self.deviceid}]/Eeprom/ByteSize",
-            )[0]
-        )
+        eeprom_size = int(self.xml_value(self.xml_device, "./Eeprom/ByteSize")[0])
         if eeprom_size:
             self.eeprom_size = self.bytes2ee(eeprom_size)
 
-        bootStrapElement = base_element.find(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Eeprom/BootStrap"
-        )
+        bootStrapElement = self.xml_find(self.xml_device, "./Eeprom/BootStrap")
         if bootStrapElement is not None:
             bootStrap = bytearray.fromhex(bootStrapElement.text)
-            cpos = 0
-            self.bs_rec_mbox_offset = struct.unpack("<H", bootStrap[cpos : cpos + 2])[0]
-            cpos += 2
-            self.bs_rec_mbox_size = struct.unpack("<H", bootStrap[cpos : cpos + 2])[0]
-            cpos += 2
-            self.bs_snd_mbox_offset = struct.unpack("<H", bootStrap[cpos : cpos + 2])[0]
-            cpos += 2
-            self.bs_snd_mbox_size = struct.unpack("<H", bootStrap[cpos : cpos + 2])[0]
-            cpos += 2
-
-        coe = 0
-        eoe = 0
-        foe = 0
-        voe = 0
-        for mb in base_element.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox"
-        ):
+            (
+                self.bs_rec_mbox_offset,
+                self.bs_rec_mbox_size,
+                self.bs_snd_mbox_offset,
+                self.bs_snd_mbox_size,
+            ) = self.bootstrap_layout.unpack_from(bootStrap)
+
+        for mb in self.xml_device_children("Mailbox"):
             for element in mb:
-                if element.tag == "CoE":
-                    coe = 0x04
-                elif element.tag == "EoE":
-                    eoe = 0x02
-                elif element.tag == "FoE":
-                    foe = 0x08
-                elif element.tag == "VoE":
-                    voe = 0x20
-        self.mailbox_protocol = coe | eoe | foe | voe
+                self.mailbox_protocol |= mailbox_protocols.get(element.tag, 0)
 
     def xmlWrite(self, base_element):
         Vendor = base_element.find("./Vendor")
         etree.SubElement(Vendor, "Id").text = self.value2xml(self.vendor_id, 8)
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
-        Mailbox = base_element.find(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox"
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
         )
+        Mailbox = Device.find("Mailbox")
         Type = Device.find("./Type")
         if Type is not None:
             Type.set("ProductCode", self.value2xml(self.product_id, 8))
             Type.set("RevisionNo", self.value2xml(self.revision_id, 8))
-            if bool(self.mailbox_protocol & 0x04):
-                CoE = base_element.find(
-                    f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox/CoE"
-                )
-                if CoE is None:
-                    etree.SubElement(Mailbox, "CoE")
-            if bool(self.mailbox_protocol & 0x02):
-                EoE = base_element.find(
-                    f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox/EoE"
-                )
-                if EoE is None:
-                    etree.SubElement(Mailbox, "EoE")
-            if bool(self.mailbox_protocol & 0x08):
-                FoE = base_element.find(
-                    f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox/FoE"
-                )
-                if FoE is None:
-                    etree.SubElement(Mailbox, "FoE")
-            if bool(self.mailbox_protocol & 0x20):
-                VoE = base_element.find(
-                    f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox/VoE"
-                )
-                if VoE is None:
-                    etree.SubElement(Mailbox, "VoE")
-
-        Eeprom = base_element.find(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Eeprom"
-        )
+            existing = set()
+            if Mailbox is not None:
+                existing = {element.tag for element in Mailbox}
+            for tag, bit in mailbox_protocols.items():
+                if self.mailbox_protocol & bit and tag not in existing:
+                    etree.SubElement(Mailbox, tag)
+
+        Eeprom = Device.find("Eeprom")
         BootStrap = etree.SubElement(Eeprom, "BootStrap")
-        blist = []
-        blist += struct.pack("<H", self.bs_rec_mbox_offset)
-        blist += struct.pack("<H", self.bs_rec_mbox_size)
-        blist += struct.pack("<H", self.bs_snd_mbox_offset)
-        blist += struct.pack("<H", self.bs_snd_mbox_size)
-        BootStrap.text = "".join([f"{b:02x}" for b in list(blist)])
+        blist = self.bootstrap_layout.pack(
+            self.bs_rec_mbox_offset,
+            self.bs_rec_mbox_size,
+            self.bs_snd_mbox_offset,
+            self.bs_snd_mbox_size,
+        )
+        BootStrap.text = blist.hex()
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}stdconfig: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("vendor_id", self.vendor_id, prefix)
-        output += self.printKeyValue("product_id", self.product_id, prefix)
-        output += self.printKeyValue("revision_id", self.revision_id, prefix)
-        output += self.printKeyValue("serial", self.serial, prefix)
-        output += self.printKeyValue(
-            "bs_rec_mbox_offset", self.bs_rec_mbox_offset, prefix
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("vendor_id", self.vendor_id, prefix))
+        output.append(self.printKeyValue("product_id", self.product_id, prefix))
+        output.append(self.printKeyValue("revision_id", self.revision_id, prefix))
+        output.append(self.printKeyValue("serial", self.serial, prefix))
+        output.append(
+            self.printKeyValue("bs_rec_mbox_offset", self.bs_rec_mbox_offset, prefix)
+        )
+        output.append(
+            self.printKeyValue("bs_rec_mbox_size", self.bs_rec_mbox_size, prefix)
+        )
+        output.append(
+            self.printKeyValue("bs_snd_mbox_offset", self.bs_snd_mbox_offset, prefix)
         )
-        output += self.printKeyValue("bs_rec_mbox_size", self.bs_rec_mbox_size, prefix)
-        output += self.printKeyValue(
-            "bs_snd_mbox_offset", self.bs_snd_mbox_offset, prefix
+        output.append(
+            self.printKeyValue("bs_snd_mbox_size", self.bs_snd_mbox_size, prefix)
         )
-        output += self.printKeyValue("bs_snd_mbox_size", self.bs_snd_mbox_size, prefix)
-        output += self.printKeyValue(
-            "std_rec_mbox_offset", self.std_rec_mbox_offset, prefix
+        output.append(
+            self.printKeyValue("std_rec_mbox_offset", self.std_rec_mbox_offset, prefix)
         )
-        output += self.printKeyValue(
-            "std_rec_mbox_size", self.std_rec_mbox_size, prefix
+        output.append(
+            self.printKeyValue("std_rec_mbox_size", self.std_rec_mbox_size, prefix)
         )
-        output += self.printKeyValue(
-            "std_snd_mbox_offset", self.std_snd_mbox_offset, prefix
+        output.append(
+            self.printKeyValue("std_snd_mbox_offset", self.std_snd_mbox_offset, prefix)
         )
-        output += self.printKeyValue(
-            "std_snd_mbox_size", self.std_snd_mbox_size, prefix
+        output.append(
+            self.printKeyValue("std_snd_mbox_size", self.std_snd_mbox_size, prefix)
         )
-        output += self.printKeyValue("mailbox_protocol", self.mailbox_protocol, prefix)
-        output += self.printKeyValue("eeprom_size", self.eeprom_size, prefix)
-        output += self.printKeyValue("version", self.version, prefix)
+        output.append(
+            self.printKeyValue("mailbox_protocol", self.mailbox_protocol, prefix)
+        )
+        output.append(self.printKeyValue("eeprom_size", self.eeprom_size, prefix))
+        output.append(self.printKeyValue("version", self.version, prefix))
         output.append("")
         return output
 
 
 class general(Base):
     cat_type = 30
-
-    def binRead(self, bindata):
-        self.startpos = self.parent.startpos
-        self.bindata = bindata
-        self.offset = 0
-        self.groupindex = self.binVarRead(bindata, 1)  # 0
-        self.imageindex = self.binVarRead(bindata, 1)  # 1
-        self.orderindex = self.binVarRead(bindata, 1)  # 2
-        self.nameindex = self.binVarRead(bindata, 1)  # 3
-        self.unknown1 = self.binVarRead(bindata, 1)  # 4
+    # Info labels, indexed by bit
+    coe_details_names = (
+        "Enable SDO",
+        "Enable SDO Info",
+        "Enable PDO Assign",
+        "Enable PDO Configuration",
+        "Enable Upload at Startup",
+        "Enable SDO complete access",
+    )
+    flags_names = (
+        "SafeOp",
+        "notLRW",
+        "MboxDataLinkLayer",
+        "IdentALStatus",
+        "IdentPhysicalMemory",
+    )
+    layout = struct.Struct(
+        "<"
+        "B"  # 0 groupindex
+        "B"  # 1 imageindex
+        "B"  # 2 orderindex
+        "B"  # 3 nameindex
+        "B"  # 4 unknown1
         # Bit 0: Enable SDO
         # Bit 1: Enable SDO Info
         # Bit 2: Enable PDO Assign
         # Bit 3: Enable PDO Configuration
         # Bit 4: Enable Upload at startup
         # Bit 5: Enable SDO complete acces
-        self.coe_details = self.binVarRead(bindata, 1)  # 5
-        self.foe_details = self.binVarRead(bindata, 1)  # 6
-        self.eoe_enabled = self.binVarRead(bindata, 1)  # 7
-        self.soe_channels = self.binVarRead(bindata, 1)  # 8 - reserved
-        self.ds402_channels = self.binVarRead(bindata, 1)  # 9 - reserved
-        self.sysman_class = self.binVarRead(bindata, 1)  # 10 - reserved
+        "B"  # 5 coe_details
+        "B"  # 6 foe_details
+        "B"  # 7 eoe_enabled
+        "B"  # 8 soe_channels - reserved
+        "B"  # 9 ds402_channels - reserved
+        "B"  # 10 sysman_class - reserved
         # Bit 0: Enable SafeOp
         # Bit 1: Enable notLRW
         # Bit 2: MboxDataLinkLayer
         # Bit 3,4: Selection of identification method as defined in Table 22
-        self.flags = self.binVarRead(bindata, 1)  # 11
-        self.current_ebus = self.binVarRead(bindata, 2)  # 12
-        self.unknown2 = self.binVarRead(bindata, 2)  # 14
-        self.phys_port01 = self.binVarRead(bindata, 1)  # 16
-        self.phys_port23 = self.binVarRead(bindata, 1)  # 17
-        self.physical_address = self.binVarRead(bindata, 2)  # 18
-        self.offset += 12  # 19
+        "B"  # 11 flags
+        "H"  # 12 current_ebus
+        "H"  # 14 unknown2
+        "B"  # 16 phys_port01
+        "B"  # 17 phys_port23
+        "H"  # 18 physical_address
+        "12x"  # 20
+    )
+
+    def binRead(self, bindata):
+        self.startpos = self.parent.startpos
+        self.bindata = bindata
+        (
+            self.groupindex,
+            self.imageindex,
+            self.orderindex,
+            self.nameindex,
+            self.unknown1,
+            self.coe_details,
+            self.foe_details,
+            self.eoe_enabled,
+            self.soe_channels,
+            self.ds402_channels,
+            self.sysman_class,
+            self.flags,
+            self.current_ebus,
+            self.unknown2,
+            self.phys_port01,
+            self.phys_port23,
+            self.physical_address,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         if self.offset != self.size():
-            output.append("SIZE ERROR:", self, self.offset, self.size())
+            print("SIZE ERROR:", self, self.offset, self.size())
         self.device_info["name"] = self.value2xmlText(self.nameindex)
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.groupindex, 1)  # 0
-        bindata += self.binVarWrite(self.imageindex, 1)  # 1
-        bindata += self.binVarWrite(self.orderindex, 1)  # 2
-        bindata += self.binVarWrite(self.nameindex, 1)  # 3
-        bindata += self.binVarWrite(self.unknown1, 1)  # 4
-        bindata += self.binVarWrite(self.coe_details, 1)  # 5
-        bindata += self.binVarWrite(self.foe_details, 1)  # 6
-        bindata += self.binVarWrite(self.eoe_enabled, 1)  # 7
-        bindata += self.binVarWrite(self.soe_channels, 1)  # 8
-        bindata += self.binVarWrite(self.ds402_channels, 1)  # 9
-        bindata += self.binVarWrite(self.sysman_class, 1)  # 10
-        bindata += self.binVarWrite(self.flags, 1)  # 11
-        bindata += self.binVarWrite(self.current_ebus, 2)  # 12
-        bindata += self.binVarWrite(self.unknown2, 2)  # 14
-        bindata += self.binVarWrite(self.phys_port01, 1)  # 16
-        bindata += self.binVarWrite(self.phys_port23, 1)  # 17
-        bindata += self.binVarWrite(self.physical_address, 2)  # 18
-        bindata += [0] * 12  # 19
+        bindata = bytearray(
+            self.layout.pack(
+                self.groupindex,
+                self.imageindex,
+                self.orderindex,
+                self.nameindex,
+                self.unknown1,
+                self.coe_details,
+                self.foe_details,
+                self.eoe_enabled,
+                self.soe_channels,
+                self.ds402_channels,
+                self.sysman_class,
+                self.flags,
+                self.current_ebus,
+                self.unknown2,
+                self.phys_port01,
+                self.phys_port23,
+                self.physical_address,
+            )
+        )
         return bindata
 
     def size(self):
@@ -626,11 +797,7 @@ class general(Base):
         # self.orderindex = self.stringSet(self.xml_value(base_element, f"./Descriptions/Devices/Device[{self.deviceid}]/Type", default="")[0])
         self.orderindex = 0
         self.nameindex = self.stringSet(
-            self.xml_value(
-                base_element,
-                f"./Descriptions/Devices/Device[{self.deviceid}]/Name",
-                default="",
-            )[0]
+            self.xml_value(self.xml_device, "./Name", default="")[0]
         )
         self.unknown1 = 0
         self.eoe_enabled = 0
@@ -646,9 +813,7 @@ class general(Base):
         self.phys_port23 = 0
         self.physical_address = 0
 
-        for mb in base_element.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Mailbox"
-        ):
+        for mb in self.xml_device_children("Mailbox"):
             for element in mb:
                 if element.tag == "EoE":
                     self.eoe_enabled = 1
@@ -656,51 +821,37 @@ class general(Base):
                     self.foe_details = 1
                 elif element.tag == "CoE":
                     details = 1
-                    details |= int(self.xml_value_parse(element.get("SdoInfo", 0))) << 1
-                    details |= (
-                        int(self.xml_value_parse(element.get("PdoAssign", 0))) << 2
-                    )
-                    details |= (
-                        int(self.xml_value_parse(element.get("PdoConfig", 0))) << 3
-                    )
-                    details |= (
-                        int(self.xml_value_parse(element.get("PdoUpload", 0))) << 4
-                    )
-                    # details |= int(self.xml_value_parse(element.get("CompleteAccess", 0))) << 5
+                    # CompleteAccess is not taken over from the XML
+                    for name, bit in coe_details_bits[:4]:
+                        details |= self.xml_int(element.get(name, 0)) << bit
                     self.coe_details = details
 
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
+        Device = self.xml_device
         if Device is not None:
             Physics = Device.get("Physics")
             if Physics:
-                ports = [0, 0, 0, 0]
-                for cn, char in enumerate(Physics):
-                    if char == "Y":
-                        ports[cn] = 0x01
-                    elif char == "K":
-                        ports[cn] = 0x03
-                self.phys_port01 = (ports[1] << 4) | ports[0]
-                self.phys_port23 = (ports[3] << 4) | ports[2]
+                # one nibble per port, port 0 in the lowest nibble
+                ports = 0
+                for shift, char in zip(range(0, 16, 4), Physics):
+                    ports |= physics_ports.get(char, 0) << shift
+                self.phys_port01 = ports & 0xFF
+                self.phys_port23 = ports >> 8
         self.device_info["name"] = self.value2xmlText(self.nameindex)
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
-        Name = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]/Name")
-        GroupType = base_element.find(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/GroupType"
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
         )
         Mailbox = etree.SubElement(Device, "Mailbox")
-        physics = ""
-        ports = [0, 0, 0, 0]
-        ports[0] = (self.phys_port01 >> 4) & 0x0F
-        ports[1] = (self.phys_port01) & 0x0F
-        ports[2] = (self.phys_port23 >> 4) & 0x0F
-        ports[3] = (self.phys_port23) & 0x0F
-        for port in ports:
-            if port == 0x01:
-                physics += "Y"
-            elif port == 0x03:
-                physics += "K"
+        Name = Device.find("Name")
+        GroupType = Device.find("GroupType")
+        ports = (
+            (self.phys_port01 >> 4) & 0x0F,
+            (self.phys_port01) & 0x0F,
+            (self.phys_port23 >> 4) & 0x0F,
+            (self.phys_port23) & 0x0F,
+        )
+        physics = "".join([physics_chars.get(port, "") for port in ports])
         Device.set("Physics", physics)
 
         Name.text = self.value2xmlText(self.nameindex)
@@ -719,26 +870,8 @@ class general(Base):
             etree.SubElement(Mailbox, "EoE")
         if self.coe_details:
             CoE = etree.SubElement(Mailbox, "CoE")
-            if bool(self.coe_details & (0x01 << 1)):
-                CoE.set("SdoInfo", "true")
-            else:
-                CoE.set("SdoInfo", "false")
-            if bool(self.coe_details & (0x01 << 2)):
-                CoE.set("PdoAssign", "true")
-            else:
-                CoE.set("PdoAssign", "false")
-            if bool(self.coe_details & (0x01 << 3)):
-                CoE.set("PdoConfig", "true")
-            else:
-                CoE.set("PdoConfig", "false")
-            if bool(self.coe_details & (0x01 << 4)):
-                CoE.set("PdoUpload", "true")
-            else:
-                CoE.set("PdoUpload", "false")
-            if bool(self.coe_details & (0x01 << 5)):
-                CoE.set("CompleteAccess", "true")
-            else:
-                CoE.set("CompleteAccess", "false")
+            for name, bit in coe_details_bits:
+                CoE.set(name, self.value2xmlBool(self.coe_details & (0x01 << bit)))
         if self.foe_details:
             etree.SubElement(Mailbox, "FoE")
 
@@ -746,14 +879,16 @@ class general(Base):
         output = []
         output.append(f"{prefix}general: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyString("nameindex", self.nameindex, prefix)
-        output += self.printKeyString("groupindex", self.groupindex, prefix)
-        output += self.printKeyString("imageindex", self.imageindex, prefix)
-        output += self.printKeyString("orderindex", self.orderindex, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyString("nameindex", self.nameindex, prefix))
+        output.append(self.printKeyString("groupindex", self.groupindex, prefix))
+        output.append(self.printKeyString("imageindex", self.imageindex, prefix))
+        output.append(self.printKeyString("orderindex", self.orderindex, prefix))
 
         """
   CoE Details:
@@ -765,191 +900,148 @@ class general(Base):
     Enable SDO complete access: .. no
         """
         output.append(f"{prefix}   coe_details:")
-        output += self.printKeyValue(
-            "  Enable SDO", (self.coe_details & (1 << 0)) and "yes" or "no", prefix
-        )
-        output += self.printKeyValue(
-            "  Enable SDO Info", (self.coe_details & (1 << 1)) and "yes" or "no", prefix
-        )
-        output += self.printKeyValue(
-            "  Enable PDO Assign",
-            (self.coe_details & (1 << 2)) and "yes" or "no",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "  Enable PDO Configuration",
-            (self.coe_details & (1 << 3)) and "yes" or "no",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "  Enable Upload at Startup",
-            (self.coe_details & (1 << 4)) and "yes" or "no",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "  Enable SDO complete access",
-            (self.coe_details & (1 << 5)) and "yes" or "no",
-            prefix,
-        )
+        for bit, name in enumerate(self.coe_details_names):
+            yes = (self.coe_details >> bit) & 0x01
+            output.append(self.printKeyValue(f"  {name}", ("no", "yes")[yes], prefix))
 
-        output += self.printKeyValue(
-            "foe_details", self.foe_details and "enabled" or "not enabled", prefix
+        output.append(
+            self.printKeyValue(
+                "foe_details", self.foe_details and "enabled" or "not enabled", prefix
+            )
         )
-        output += self.printKeyValue(
-            "eoe_enabled", self.eoe_enabled and "enabled" or "not enabled", prefix
+        output.append(
+            self.printKeyValue(
+                "eoe_enabled", self.eoe_enabled and "enabled" or "not enabled", prefix
+            )
         )
         output.append("")
 
-        # output += self.printKeyValue("soe_channels", self.soe_channels, prefix)
-        # output += self.printKeyValue("ds402_channels", self.ds402_channels, prefix)
-        # output += self.printKeyValue("sysman_class", self.sysman_class, prefix)
+        # output.append(self.printKeyValue("soe_channels", self.soe_channels, prefix))
+        # output.append(self.printKeyValue("ds402_channels", self.ds402_channels, prefix))
+        # output.append(self.printKeyValue("sysman_class", self.sysman_class, prefix))
 
-        output += self.printKeyValue(
-            "Flag SafeOp",
-            (self.flags & (1 << 0)) and "enabled" or "not enabled",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "Flag notLRW",
-            (self.flags & (1 << 0)) and "enabled" or "not enabled",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "Flag MboxDataLinkLayer",
-            (self.flags & (1 << 0)) and "enabled" or "not enabled",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "Flag IdentALStatus",
-            (self.flags & (1 << 0)) and "enabled" or "not enabled",
-            prefix,
-        )
-        output += self.printKeyValue(
-            "Flag IdentPhysicalMemory",
-            (self.flags & (1 << 0)) and "enabled" or "not enabled",
-            prefix,
-        )
+        for bit, name in enumerate(self.flags_names):
+            enabled = (self.flags >> bit) & 0x01
+            output.append(
+                self.printKeyValue(
+                    f"Flag {name}", ("not enabled", "enabled")[enabled], prefix
+                )
+            )
         output.append("")
-        output += self.printKeyValue("current_ebus", self.current_ebus, prefix)
-        phys_port0 = (self.phys_port01) & 0x0F
-        phys_port1 = (self.phys_port01 >> 4) & 0x0F
-        phys_port2 = (self.phys_port23) & 0x0F
-        phys_port3 = (self.phys_port23 >> 4) & 0x0F
+        output.append(self.printKeyValue("current_ebus", self.current_ebus, prefix))
+        ports = self.phys_port01 | (self.phys_port23 << 8)
         modes = {0: "not used", 1: "MII", 3: "EBUS"}
         output.append(f"{prefix}   Physical Ports:")
-        output += self.printKeyValue(
-            "  Port 0", modes.get(phys_port0, phys_port0), prefix
-        )
-        output += self.printKeyValue(
-            "  Port 1", modes.get(phys_port1, phys_port1), prefix
-        )
-        output += self.printKeyValue(
-            "  Port 2", modes.get(phys_port2, phys_port2), prefix
-        )
-        output += self.printKeyValue(
-            "  Port 3", modes.get(phys_port3, phys_port3), prefix
-        )
+        for port in range(4):
+            mode = (ports >> (port * 4)) & 0x0F
+            output.append(
+                self.printKeyValue(f"  Port {port}", modes.get(mode, mode), prefix)
+            )
         output.append("")
-        output += self.printKeyValue("physical_address", self.physical_address, prefix)
+        output.append(
+            self.printKeyValue("physical_address", self.physical_address, prefix)
+        )
         output.append("")
         return output
 
 
 class txpdo(Base):
     cat_type = 50
+    layout = struct.Struct(
+        "<"
+        "H"  # 0 index
+        "B"  # 2 entries
+        "B"  # 3 syncmanager
+        "B"  # 4 dcsync
+        "B"  # 5 name_index
+        "H"  # 6 flags
+    )
 
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.index = self.binVarRead(bindata, 2)  # 0
-        self.entries = self.binVarRead(bindata, 1)  # 2
-        self.syncmanager = self.binVarRead(bindata, 1)  # 3
-        self.dcsync = self.binVarRead(bindata, 1)  # 4
-        self.name_index = self.binVarRead(bindata, 1)  # 5
-        self.flags = self.binVarRead(bindata, 2)  # 6
-        self.entrys = {}
-        entry_num = 0
-        while True:
-            self.entrys[entry_num] = pdo_entry(self)
-            entry_size = self.entrys[entry_num].size()
-            self.entrys[entry_num].binRead(
-                bindata[self.offset : self.offset + entry_size]
-            )
-            self.offset += entry_size
-            entry_num += 1
-            if (len(bindata) - self.offset) < entry_size:
+        (
+            self.index,
+            self.entries,
+            self.syncmanager,
+            self.dcsync,
+            self.name_index,
+            self.flags,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
+        self.entrys = []
+        entrydata = memoryview(bindata)
+        for _ in range(self.entries):
+            entry = pdo_entry(self)
+            entry_size = entry.size()
+            if len(bindata) - self.offset < entry_size:
+                print("SIZE ERROR:", self, self.offset, self.entries)
                 break
+            entry.binRead(entrydata[self.offset : self.offset + entry_size])
+            self.entrys.append(entry)
+            self.offset += entry_size
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.index, 2)  # 0
-        bindata += self.binVarWrite(self.entries, 1)  # 2
-        bindata += self.binVarWrite(self.syncmanager, 1)  # 3
-        bindata += self.binVarWrite(self.dcsync, 1)  # 4
-        bindata += self.binVarWrite(self.name_index, 1)  # 5
-        bindata += self.binVarWrite(self.flags, 2)  # 6
-        for num, entry in self.entrys.items():
-            bindata += entry.binWrite()
-        return bindata
+        header = self.layout.pack(
+            self.index,
+            self.entries,
+            self.syncmanager,
+            self.dcsync,
+            self.name_index,
+            self.flags,
+        )
+        return header + b"".join([entry.binWrite() for entry in self.entrys])
 
     def size(self):
         return 8
 
     def xmlRead(self, base_element):
-        self.index = int(self.xml_value_parse(base_element.find("./Index").text))
-        self.entries = 0
+        self.index = self.xml_int(base_element.findtext("Index"))
         self.syncmanager = int(base_element.get("Sm"))
         self.dcsync = 0
         self.name_index = self.stringSet(self.xml_value(base_element, "./Name")[0])
-        self.flags = int(base_element.get("Mandatory", 0) in {"true", "1"})
-        self.flags |= int(base_element.get("Fixed", 0) in {"true", "1"}) << 4
-        self.flags |= int(base_element.get("Virtual", 0) in {"true", "1"}) << 5
-        self.flags |= (
-            int(base_element.get("OverwrittenByModule", 0) in {"true", "1"}) << 7
-        )
-        self.entrys = {}
-        for entry in base_element.findall("./Entry"):
-            self.entrys[self.entries] = pdo_entry(self)
-            self.entrys[self.entries].xmlRead(entry)
-            self.entries += 1
+        self.flags = 0
+        for name, mask in pdo_flags.items():
+            if base_element.get(name) in xml_true:
+                self.flags |= mask
+        self.entrys = []
+        for element in base_element.iterchildren("Entry"):
+            entry = pdo_entry(self)
+            entry.xmlRead(element)
+            self.entrys.append(entry)
+        self.entries = len(self.entrys)
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
-        self.flags |= int(base_element.get("Virtual", 0) in {"true", "1"}) << 5
-        self.flags |= (
-            int(base_element.get("OverwrittenByModule", 0) in {"true", "1"}) << 7
-        )
-        element = etree.SubElement(
-            Device,
-            "TxPdo",
-            Sm=str(self.syncmanager),
-            Mandatory=self.value2xmlBool(bool(self.flags & 0x01)),
-            Fixed=self.value2xmlBool(bool(self.flags & (0x01 << 4))),
-            Virtual=self.value2xmlBool(bool(self.flags & (0x01 << 5))),
-            OverwrittenByModule=self.value2xmlBool(bool(self.flags & (0x01 << 7))),
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
         )
+        attrib = {"Sm": str(self.syncmanager)}
+        for name, mask in pdo_flags.items():
+            attrib[name] = self.value2xmlBool(self.flags & mask)
+        element = etree.SubElement(Device, "TxPdo", attrib)
         etree.SubElement(element, "Index").text = self.value2xml(self.index, 4)
         etree.SubElement(element, "Name").text = self.value2xmlText(self.name_index)
-        for num, entry in self.entrys.items():
+        for entry in self.entrys:
             entry.xmlWrite(element)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}txpdo: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("index", self.index, prefix)
-        output += self.printKeyValue("entries", self.entries, prefix)
-        output += self.printKeyValue("syncmanager", self.syncmanager, prefix)
-        output += self.printKeyValue("dcsync", self.dcsync, prefix)
-        output += self.printKeyString("name_index", self.name_index, prefix)
-        output += self.printKeyValue("flags", self.flags, prefix)
-        for num, entry in self.entrys.items():
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("index", self.index, prefix))
+        output.append(self.printKeyValue("entries", self.entries, prefix))
+        output.append(self.printKeyValue("syncmanager", self.syncmanager, prefix))
+        output.append(self.printKeyValue("dcsync", self.dcsync, prefix))
+        output.append(self.printKeyString("name_index", self.name_index, prefix))
+        output.append(self.printKeyValue("flags", self.flags, prefix))
+        for num, entry in enumerate(self.entrys):
             output.append(f"{prefix}   {num}:")
             output += entry.Info(f"{prefix}   ")
         output.append("")
@@ -958,95 +1050,93 @@ class txpdo(Base):
 
 class rxpdo(Base):
     cat_type = 51
+    layout = txpdo.layout
 
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.index = self.binVarRead(bindata, 2)  # 0
-        self.entries = self.binVarRead(bindata, 1)  # 2
-        self.syncmanager = self.binVarRead(bindata, 1)  # 3
-        self.dcsync = self.binVarRead(bindata, 1)  # 4
-        self.name_index = self.binVarRead(bindata, 1)  # 5
-        self.flags = self.binVarRead(bindata, 2)  # 6
-        self.entrys = {}
-        entry_num = 0
-        while True:
-            self.entrys[entry_num] = pdo_entry(self)
-            entry_size = self.entrys[entry_num].size()
-            self.entrys[entry_num].binRead(
-                bindata[self.offset : self.offset + entry_size]
-            )
-            self.offset += entry_size
-            entry_num += 1
-            if (len(bindata) - self.offset) < entry_size:
+        (
+            self.index,
+            self.entries,
+            self.syncmanager,
+            self.dcsync,
+            self.name_index,
+            self.flags,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
+        self.entrys = []
+        entrydata = memoryview(bindata)
+        for _ in range(self.entries):
+            entry = pdo_entry(self)
+            entry_size = entry.size()
+            if len(bindata) - self.offset < entry_size:
+                print("SIZE ERROR:", self, self.offset, self.entries)
                 break
+            entry.binRead(entrydata[self.offset : self.offset + entry_size])
+            self.entrys.append(entry)
+            self.offset += entry_size
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.index, 2)  # 0
-        bindata += self.binVarWrite(self.entries, 1)  # 2
-        bindata += self.binVarWrite(self.syncmanager, 1)  # 3
-        bindata += self.binVarWrite(self.dcsync, 1)  # 4
-        bindata += self.binVarWrite(self.name_index, 1)  # 5
-        bindata += self.binVarWrite(self.flags, 2)  # 6
-        for num, entry in self.entrys.items():
-            bindata += entry.binWrite()
-        return bindata
+        header = self.layout.pack(
+            self.index,
+            self.entries,
+            self.syncmanager,
+            self.dcsync,
+            self.name_index,
+            self.flags,
+        )
+        return header + b"".join([entry.binWrite() for entry in self.entrys])
 
     def size(self):
         return 8
 
     def xmlRead(self, base_element):
-        self.index = int(self.xml_value_parse(base_element.find("./Index").text))
-        self.entries = 0
+        self.index = self.xml_int(base_element.findtext("Index"))
         self.syncmanager = int(base_element.get("Sm"))
         self.dcsync = 0
         self.name_index = self.stringSet(self.xml_value(base_element, "./Name")[0])
-        self.flags = int(base_element.get("Mandatory", 0) in {"true", "1"})
-        self.flags |= int(base_element.get("Fixed", 0) in {"true", "1"}) << 4
-        self.flags |= int(base_element.get("Virtual", 0) in {"true", "1"}) << 5
-        self.flags |= (
-            int(base_element.get("OverwrittenByModule", 0) in {"true", "1"}) << 7
-        )
-        self.entrys = {}
-        for entry in base_element.findall("./Entry"):
-            self.entrys[self.entries] = pdo_entry(self)
-            self.entrys[self.entries].xmlRead(entry)
-            self.entries += 1
+        self.flags = 0
+        for name, mask in pdo_flags.items():
+            if base_element.get(name) in xml_true:
+                self.flags |= mask
+        self.entrys = []
+        for element in base_element.iterchildren("Entry"):
+            entry = pdo_entry(self)
+            entry.xmlRead(element)
+            self.entrys.append(entry)
+        self.entries = len(self.entrys)
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
-        element = etree.SubElement(
-            Device,
-            "RxPdo",
-            Sm=str(self.syncmanager),
-            Mandatory=self.value2xmlBool(bool(self.flags & 0x01)),
-            Fixed=self.value2xmlBool(bool(self.flags & (0x01 << 4))),
-            Virtual=self.value2xmlBool(bool(self.flags & (0x01 << 5))),
-            OverwrittenByModule=self.value2xmlBool(bool(self.flags & (0x01 << 7))),
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
         )
+        attrib = {"Sm": str(self.syncmanager)}
+        for name, mask in pdo_flags.items():
+            attrib[name] = self.value2xmlBool(self.flags & mask)
+        element = etree.SubElement(Device, "RxPdo", attrib)
         etree.SubElement(element, "Index").text = self.value2xml(self.index, 4)
         etree.SubElement(element, "Name").text = self.value2xmlText(self.name_index)
-        for num, entry in self.entrys.items():
+        for entry in self.entrys:
             entry.xmlWrite(element)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}rxpdo: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("index", self.index, prefix)
-        output += self.printKeyValue("entries", self.entries, prefix)
-        output += self.printKeyValue("syncmanager", self.syncmanager, prefix)
-        output += self.printKeyValue("dcsync", self.dcsync, prefix)
-        output += self.printKeyString("name_index", self.name_index, prefix)
-        output += self.printKeyValue("flags", self.flags, prefix)
-        for num, entry in self.entrys.items():
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("index", self.index, prefix))
+        output.append(self.printKeyValue("entries", self.entries, prefix))
+        output.append(self.printKeyValue("syncmanager", self.syncmanager, prefix))
+        output.append(self.printKeyValue("dcsync", self.dcsync, prefix))
+        output.append(self.printKeyString("name_index", self.name_index, prefix))
+        output.append(self.printKeyValue("flags", self.flags, prefix))
+        for num, entry in enumerate(self.entrys):
             output.append(f"{prefix}   {num}:")
             output += entry.Info(f"{prefix}   ")
         output.append("")
@@ -1054,43 +1144,63 @@ class rxpdo(Base):
 
 
 class pdo_entry(Base):
+    __slots__ = (
+        "bit_length",
+        "data_type",
+        "flags",
+        "index",
+        "string_index",
+        "subindex",
+    )
+    layout = struct.Struct(
+        "<"
+        "H"  # 0 index
+        "B"  # 2 subindex
+        "B"  # 3 string_index
+        "B"  # 4 data_type
+        "B"  # 5 bit_length
+        "H"  # 6 flags
+    )
+
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.index = self.binVarRead(bindata, 2)  # 0
-        self.subindex = self.binVarRead(bindata, 1)  # 2
-        self.string_index = self.binVarRead(bindata, 1)  # 3
-        self.data_type = self.binVarRead(bindata, 1)  # 4
-        self.bit_length = self.binVarRead(bindata, 1)  # 5
-        self.flags = self.binVarRead(bindata, 2)  # 6
+        (
+            self.index,
+            self.subindex,
+            self.string_index,
+            self.data_type,
+            self.bit_length,
+            self.flags,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         if self.offset != self.size():
             print("SIZE ERROR:", self, self.offset, self.size())
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.index, 2)  # 0
-        bindata += self.binVarWrite(self.subindex, 1)  # 2
-        bindata += self.binVarWrite(self.string_index, 1)  # 3
-        bindata += self.binVarWrite(self.data_type, 1)  # 4
-        bindata += self.binVarWrite(self.bit_length, 1)  # 5
-        bindata += self.binVarWrite(self.flags, 2)  # 6
-        return bindata
+        return self.layout.pack(
+            self.index,
+            self.subindex,
+            self.string_index,
+            self.data_type,
+            self.bit_length,
+            self.flags,
+        )
 
     def size(self):
         return 8
 
     def xmlRead(self, base_element):
-        self.index = int(self.xml_value(base_element, "./Index")[0])
-        self.subindex = int(self.xml_value(base_element, "./SubIndex")[0])
+        self.index = self.xml_int(base_element.findtext("Index") or 0)
+        self.subindex = self.xml_int(base_element.findtext("SubIndex") or 0)
         self.string_index = self.stringSet(
             self.xml_value(base_element, "./Name", default="")[0]
         )
         self.data_type = self.datatypeSet(
-            self.xml_value(base_element, "./DataType", default="")[0]
+            (base_element.findtext("DataType") or "").strip()
         )
-        self.bit_length = int(self.xml_value(base_element, "./BitLen")[0])
+        self.bit_length = self.xml_int(base_element.findtext("BitLen") or 0)
         self.flags = 0
 
     def xmlWrite(self, base_element):
@@ -1107,16 +1217,18 @@ class pdo_entry(Base):
         output = []
         output.append(f"{prefix}pdo_entry:")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("index", self.index, prefix)
-        output += self.printKeyValue("subindex", self.subindex, prefix)
-        output += self.printKeyString("string_index", self.string_index, prefix)
-        output += self.printKeyDatatype("data_type", self.data_type, prefix)
-        output += self.printKeyValue("bit_length", self.bit_length, prefix)
-        output += self.printKeyValue("flags", self.flags, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("index", self.index, prefix))
+        output.append(self.printKeyValue("subindex", self.subindex, prefix))
+        output.append(self.printKeyString("string_index", self.string_index, prefix))
+        output.append(self.printKeyDatatype("data_type", self.data_type, prefix))
+        output.append(self.printKeyValue("bit_length", self.bit_length, prefix))
+        output.append(self.printKeyValue("flags", self.flags, prefix))
         output.append("")
         return output
 
@@ -1128,59 +1240,49 @@ class fmmu(Base):
         self.startpos = self.parent.startpos
         self.bindata = bindata
         self.offset = 0
-        self.entrys = {}
-        entry_num = 0
-        if len(bindata) == self.offset:
-            return 0
-        while True:
-            self.entrys[entry_num] = fmmu_entry(self)
-            entry_size = self.entrys[entry_num].size()
-            self.entrys[entry_num].binRead(
-                bindata[self.offset : self.offset + entry_size]
-            )
+        self.entrys = []
+        entry_size = fmmu_entry.layout.size
+        for _ in range(len(bindata) // entry_size):
+            entry = fmmu_entry(self)
+            entry.binRead(bindata[self.offset : self.offset + entry_size])
+            self.entrys.append(entry)
             self.offset += entry_size
-            entry_num += 1
-            if (len(bindata) - self.offset) < entry_size:
-                break
         if self.offset % 2 != 0:
             self.fill = bindata[-1]
             self.offset += 1
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        for num, entry in self.entrys.items():
-            bindata += entry.binWrite()
+        bindata = b"".join([entry.binWrite() for entry in self.entrys])
         if len(bindata) % 2 != 0:
-            bindata += [0]
+            bindata += b"\x00"
         return bindata
 
     def size(self):
         return 0
 
     def xmlRead(self, base_element):
-        self.entrys = {}
-        entry_num = 0
-        for fmmu in base_element.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Fmmu"
-        ):
-            self.entrys[entry_num] = fmmu_entry(self)
-            self.entrys[entry_num].xmlRead(fmmu)
-            entry_num += 1
+        self.entrys = []
+        for fmmu in self.xml_device_children("Fmmu"):
+            entry = fmmu_entry(self)
+            entry.xmlRead(fmmu)
+            self.entrys.append(entry)
 
     def xmlWrite(self, base_element):
-        for num, entry in self.entrys.items():
+        for entry in self.entrys:
             entry.xmlWrite(base_element)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}fmmu: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        for num, entry in self.entrys.items():
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        for num, entry in enumerate(self.entrys):
             output.append(f"{prefix}   {num}:")
             output += entry.Info(f"{prefix}   ")
         output.append("")
@@ -1188,53 +1290,47 @@ class fmmu(Base):
 
 
 class fmmu_entry(Base):
+    __slots__ = ("usage",)
+    layout = struct.Struct("<B")  # 0 usage
+
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.usage = self.binVarRead(bindata, 1)  # 0
+        (self.usage,) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         if self.offset != self.size():
             print("SIZE ERROR:", self, self.offset, self.size())
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.usage, 1)  # 0
-        return bindata
+        return self.layout.pack(self.usage)
 
     def size(self):
         return 1
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
+        )
         Fmmu = etree.SubElement(Device, "Fmmu")
-        if self.usage == 0x01:
-            Fmmu.text = "Outputs"
-        elif self.usage == 0x02:
-            Fmmu.text = "Inputs"
-        elif self.usage == 0x03:
-            Fmmu.text = "MBoxState"
+        Fmmu.text = fmmu_usage_names.get(self.usage)
 
     def xmlRead(self, base_element):
         self.usage = 0
         if base_element is not None:
-            text = base_element.text
-            if text == "Outputs":
-                self.usage = 0x01
-            elif text == "Inputs":
-                self.usage = 0x02
-            elif text == "MBoxState":
-                self.usage = 0x03
+            self.usage = fmmu_usages.get(base_element.text, 0)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}fmmu_entry:")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("usage", self.usage, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("usage", self.usage, prefix))
         output.append("")
         return output
 
@@ -1246,54 +1342,43 @@ class syncm(Base):
         self.startpos = self.parent.startpos
         self.bindata = bindata
         self.offset = 0
-        self.entrys = {}
-        entry_num = 0
-        if len(bindata) == self.offset:
-            return 0
-        while True:
-            self.entrys[entry_num] = syncm_entry(self)
-            entry_size = self.entrys[entry_num].size()
-            self.entrys[entry_num].binRead(
-                bindata[self.offset : self.offset + entry_size]
-            )
+        self.entrys = []
+        entry_size = syncm_entry.layout.size
+        for _ in range(len(bindata) // entry_size):
+            entry = syncm_entry(self)
+            entry.binRead(bindata[self.offset : self.offset + entry_size])
+            self.entrys.append(entry)
             self.offset += entry_size
-            entry_num += 1
-            if (len(bindata) - self.offset) < entry_size:
-                break
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        for num, entry in self.entrys.items():
-            bindata += entry.binWrite()
-        return bindata
+        return b"".join([entry.binWrite() for entry in self.entrys])
 
     def size(self):
         return 0
 
     def xmlRead(self, base_element):
-        self.entrys = {}
-        entry_num = 0
-        for syncm in base_element.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Sm"
-        ):
-            self.entrys[entry_num] = syncm_entry(self)
-            self.entrys[entry_num].xmlRead(syncm)
-            entry_num += 1
+        self.entrys = []
+        for syncm in self.xml_device_children("Sm"):
+            entry = syncm_entry(self)
+            entry.xmlRead(syncm)
+            self.entrys.append(entry)
 
     def xmlWrite(self, base_element):
-        for num, entry in self.entrys.items():
+        for entry in self.entrys:
             entry.xmlWrite(base_element)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}syncm: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        for num, entry in self.entrys.items():
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        for num, entry in enumerate(self.entrys):
             output.append(f"{prefix}   {num}:")
             output += entry.Info(f"{prefix}   ")
         output.append("")
@@ -1301,53 +1386,65 @@ class syncm(Base):
 
 
 class syncm_entry(Base):
+    __slots__ = (
+        "control",
+        "enable",
+        "lenght",
+        "phys_address",
+        "status",
+        "type",
+    )
+    layout = struct.Struct(
+        "<"
+        "H"  # 0 phys_address
+        "H"  # 2 lenght
+        "B"  # 4 control
+        "B"  # 5 status
+        "B"  # 6 enable
+        "B"  # 7 type
+    )
+
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.phys_address = self.binVarRead(bindata, 2)  # 0
-        self.lenght = self.binVarRead(bindata, 2)  # 2
-        self.control = self.binVarRead(bindata, 1)  # 4
-        self.status = self.binVarRead(bindata, 1)  # 5
-        self.enable = self.binVarRead(bindata, 1)  # 6
-        self.type = self.binVarRead(bindata, 1)  # 7
+        (
+            self.phys_address,
+            self.lenght,
+            self.control,
+            self.status,
+            self.enable,
+            self.type,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         if self.offset != self.size():
             print("SIZE ERROR:", self, self.offset, self.size())
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.phys_address, 2)  # 0
-        bindata += self.binVarWrite(self.lenght, 2)  # 2
-        bindata += self.binVarWrite(self.control, 1)  # 4
-        bindata += self.binVarWrite(self.status, 1)  # 5
-        bindata += self.binVarWrite(self.enable, 1)  # 6
-        bindata += self.binVarWrite(self.type, 1)  # 7
-        return bindata
+        return self.layout.pack(
+            self.phys_address,
+            self.lenght,
+            self.control,
+            self.status,
+            self.enable,
+            self.type,
+        )
 
     def size(self):
         return 8
 
     def xmlRead(self, base_element):
-        self.phys_address = int(
-            self.xml_value_parse(base_element.get("StartAddress", 0))
-        )
-        self.lenght = int(self.xml_value_parse(base_element.get("DefaultSize", 0)))
-        self.control = int(self.xml_value_parse(base_element.get("ControlByte", 0)))
+        self.phys_address = self.xml_int(base_element.get("StartAddress", 0))
+        self.lenght = self.xml_int(base_element.get("DefaultSize", 0))
+        self.control = self.xml_int(base_element.get("ControlByte", 0))
         self.status = 0
-        self.enable = int(self.xml_value_parse(base_element.get("Enable", 0)))
-        self.type = 0
-        if base_element.text == "MBoxOut":
-            self.type = 1
-        elif base_element.text == "MBoxIn":
-            self.type = 2
-        elif base_element.text == "Outputs":
-            self.type = 3
-        elif base_element.text == "Inputs":
-            self.type = 4
+        self.enable = self.xml_int(base_element.get("Enable", 0))
+        self.type = syncm_types.get(base_element.text, 0)
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
+        )
         Sm = etree.SubElement(
             Device,
             "Sm",
@@ -1356,50 +1453,70 @@ class syncm_entry(Base):
             ControlByte=self.value2xml(self.control, 2),
             DefaultSize=str(self.lenght),
         )
-        if self.type == 1:
-            Sm.text = "MBoxOut"
-        elif self.type == 2:
-            Sm.text = "MBoxIn"
-        elif self.type == 3:
-            Sm.text = "Outputs"
-        elif self.type == 4:
-            Sm.text = "Inputs"
+        Sm.text = syncm_type_names.get(self.type)
 
     def Info(self, prefix=""):
         output = []
         output.append(f"{prefix}syncm_entry:")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("phys_address", self.phys_address, prefix)
-        output += self.printKeyValue("lenght", self.lenght, prefix)
-        output += self.printKeyValue("control", self.control, prefix)
-        output += self.printKeyValue("status", self.status, prefix)
-        output += self.printKeyValue("enable", self.enable, prefix)
-        output += self.printKeyValue("type", self.type, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("phys_address", self.phys_address, prefix))
+        output.append(self.printKeyValue("lenght", self.lenght, prefix))
+        output.append(self.printKeyValue("control", self.control, prefix))
+        output.append(self.printKeyValue("status", self.status, prefix))
+        output.append(self.printKeyValue("enable", self.enable, prefix))
+        output.append(self.printKeyValue("type", self.type, prefix))
         output.append("")
         return output
 
 
 class dclock(Base):
+    __slots__ = (
+        "assignActivate",
+        "cycleTime0",
+        "cycleTime1",
+        "descIdx",
+        "nameIdx",
+        "shiftTime0",
+        "shiftTime1",
+        "sync0CycleFactor",
+        "sync1CycleFactor",
+        "unknown1",
+    )
     cat_type = 60
     # fill_n = 28
     fill_n = 4
+    layout = struct.Struct(
+        "<"
+        "I"  # 0 cycleTime0
+        "I"  # 4 shiftTime0
+        "I"  # 8 shiftTime1
+        "H"  # 12 sync1CycleFactor
+        "H"  # 14 assignActivate
+        "H"  # 16 sync0CycleFactor
+        "B"  # 18 nameIdx
+        "B"  # 19 descIdx
+    )
 
     def binRead(self, bindata):
         self.startpos = self.parent.startpos
         self.bindata = bindata
-        self.offset = 0
-        self.cycleTime0 = self.binVarRead(bindata, 4)  # 0
-        self.shiftTime0 = self.binVarRead(bindata, 4)  # 4
-        self.shiftTime1 = self.binVarRead(bindata, 4)  # 8
-        self.sync1CycleFactor = self.binVarRead(bindata, 2)  # 12
-        self.assignActivate = self.binVarRead(bindata, 2)  # 14
-        self.sync0CycleFactor = self.binVarRead(bindata, 2)  # 16
-        self.nameIdx = self.binVarRead(bindata, 1)  # 18
-        self.descIdx = self.binVarRead(bindata, 1)  # 19
+        (
+            self.cycleTime0,
+            self.shiftTime0,
+            self.shiftTime1,
+            self.sync1CycleFactor,
+            self.assignActivate,
+            self.sync0CycleFactor,
+            self.nameIdx,
+            self.descIdx,
+        ) = self.layout.unpack_from(bindata, 0)
+        self.offset = self.layout.size
         self.unknown1 = bindata[self.offset : self.offset + self.fill_n]  # 20
         self.offset += self.fill_n
         if self.offset != self.size():
@@ -1407,20 +1524,23 @@ class dclock(Base):
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        bindata += self.binVarWrite(self.cycleTime0, 4)  # 0
-        bindata += self.binVarWrite(self.shiftTime0, 4)  # 4
-        bindata += self.binVarWrite(self.shiftTime1, 4)  # 8
-        bindata += self.binVarWrite(self.sync1CycleFactor, 2)  # 12
-        bindata += self.binVarWrite(self.assignActivate, 2)  # 14
-        bindata += self.binVarWrite(self.sync0CycleFactor, 2)  # 16
-        bindata += self.binVarWrite(self.nameIdx, 1)  # 18
-        bindata += self.binVarWrite(self.descIdx, 1)  # 19
+        bindata = bytearray(
+            self.layout.pack(
+                self.cycleTime0,
+                self.shiftTime0,
+                self.shiftTime1,
+                self.sync1CycleFactor,
+                self.assignActivate,
+                self.sync0CycleFactor,
+                self.nameIdx,
+                self.descIdx,
+            )
+        )
         bindata += self.unknown1  # 20
         return bindata
 
     def size(self):
-        return 20 + self.fill_n
+        return self.layout.size + self.fill_n
 
     def xmlRead(self, base_element):
         self.nameIdx = self.stringSet(
@@ -1437,11 +1557,13 @@ class dclock(Base):
         self.shiftTime1 = int(self.xml_value(base_element, "./ShiftTimeSync1")[0])
         self.sync0CycleFactor = 0
         self.sync1CycleFactor = 0
-        self.unknown1 = [0] * self.fill_n
+        self.unknown1 = bytes(self.fill_n)
 
     def xmlWrite(self, base_element):
-        Device = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
-        Dc = base_element.find(f"./Descriptions/Devices/Device[{self.deviceid}]/Dc")
+        Device = self.xml_find(
+            base_element, f"./Descriptions/Devices/Device[{self.deviceid}]"
+        )
+        Dc = Device.find("Dc")
         if Dc is None:
             Dc = etree.SubElement(Device, "Dc")
 
@@ -1470,18 +1592,24 @@ class dclock(Base):
         output = []
         output.append(f"{prefix}dclock: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("cycleTime0", self.cycleTime0, prefix)
-        output += self.printKeyValue("shiftTime0", self.shiftTime0, prefix)
-        output += self.printKeyValue("shiftTime1", self.shiftTime1, prefix)
-        output += self.printKeyValue("sync1CycleFactor", self.sync1CycleFactor, prefix)
-        output += self.printKeyValue("assignActivate", self.assignActivate, prefix)
-        output += self.printKeyValue("sync0CycleFactor", self.sync0CycleFactor, prefix)
-        output += self.printKeyString("nameIdx", self.nameIdx, prefix)
-        output += self.printKeyString("descIdx", self.descIdx, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("cycleTime0", self.cycleTime0, prefix))
+        output.append(self.printKeyValue("shiftTime0", self.shiftTime0, prefix))
+        output.append(self.printKeyValue("shiftTime1", self.shiftTime1, prefix))
+        output.append(
+            self.printKeyValue("sync1CycleFactor", self.sync1CycleFactor, prefix)
+        )
+        output.append(self.printKeyValue("assignActivate", self.assignActivate, prefix))
+        output.append(
+            self.printKeyValue("sync0CycleFactor", self.sync0CycleFactor, prefix)
+        )
+        output.append(self.printKeyString("nameIdx", self.nameIdx, prefix))
+        output.append(self.printKeyString("descIdx", self.descIdx, prefix))
         output.append("")
         return output
 
@@ -1494,15 +1622,15 @@ class strings(Base):
         self.startpos = self.parent.startpos
         self.bindata = bindata
         self.strings = [""]
-        self.offset = 0
-        self.num_strings = bindata[self.offset]
-        self.offset += 1
+        self.num_strings = bindata[0]
+        offset = 1
         for strn in range(self.num_strings):
-            strlen = bindata[self.offset]
-            self.offset += 1
-            text = bindata[self.offset : self.offset + strlen].decode()
-            self.strings.append(text)
-            self.offset += strlen
+            strlen = bindata[offset]
+            offset += 1
+            # decode straight from the buffer, without an intermediate bytes copy
+            self.strings.append(str(bindata[offset : offset + strlen], "utf-8"))
+            offset += strlen
+        self.offset = offset
 
         if self.offset % 2 != 0:
             self.fill = bindata[-1]
@@ -1510,15 +1638,14 @@ class strings(Base):
         return self.offset
 
     def binWrite(self):
-        bindata = []
-        num_strings = len(self.strings[1:])
-        bindata += self.binVarWrite(num_strings, 1)
-        for text in self.strings[1:]:
-            strlen = len(text.encode())
-            bindata += self.binVarWrite(strlen, 1)
-            bindata += list(text.encode())
+        num_strings = len(self.strings) - 1
+        bindata = bytearray((num_strings,))
+        for text in itertools.islice(self.strings, 1, None):
+            encoded = text.encode()
+            bindata.append(len(encoded))
+            bindata += encoded
         if len(bindata) % 2 != 0:
-            bindata += [self.fill]
+            bindata.append(self.fill)
         return bindata
 
     def size(self):
@@ -1532,16 +1659,18 @@ class strings(Base):
 
     def Info(self, prefix=""):
         output = []
-        self.num_strings = len(self.parent.strings[1:])
+        self.num_strings = len(self.parent.strings) - 1
         output.append(f"{prefix}strings: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("Strings", self.num_strings, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("Strings", self.num_strings, prefix))
         for tn, text in enumerate(self.strings):
-            output += self.printKeyValue(f"{tn}", f"'{text}'", prefix)
+            output.append(self.printKeyValue(f"{tn}", f"'{text}'", prefix))
         output.append("")
         return output
 
@@ -1571,12 +1700,14 @@ class unknown_cat(Base):
         output = []
         output.append(f"{prefix}UNKNOWN CATALOG: {self.startpos}")
         if self.debug > 0:
-            output.append(f"{prefix}   bin:", list(self.bindata))
-        if self.bindata and list(self.bindata) != list(self.binWrite()):
-            output.append(f"{prefix}   bin:", list(self.bindata))
-            output.append(f"{prefix}   bak:", list(self.binWrite()))
-        output += self.printKeyValue("Type-Id", self.cat_type, prefix)
-        output += self.printKeyValue("Cat-Size", self.cat_size, prefix)
+            output.append(f"{prefix}   bin: {list(self.bindata)}")
+        if self.bindata:
+            written = self.binWrite()
+            if self.bindata != written:
+                output.append(f"{prefix}   bin: {list(self.bindata)}")
+                output.append(f"{prefix}   bak: {list(written)}")
+        output.append(self.printKeyValue("Type-Id", self.cat_type, prefix))
+        output.append(self.printKeyValue("Cat-Size", self.cat_size, prefix))
         output.append("")
         return output
 
@@ -1592,11 +1723,21 @@ cat_mapping = {
     "dclock": dclock,
 }
 
+cat_types = {cat_class.cat_type: cat_class for cat_class in cat_mapping.values()}
+
 
 class Esi(Base):
+    catalog_header = struct.Struct(
+        "<"
+        "H"  # 0 cat_type
+        "H"  # 2 cat_size in words
+    )
+    # plain attribute here, shadows the Base property
+    xml_device = None
+
     def __init__(self, filename, lcid=None, deviceid=None, debug=0):
         self.lcid = lcid
-        self.lcids = []
+        self.lcids = set()
         if deviceid is None:
             deviceid = "1"
         self.deviceid = deviceid
@@ -1605,9 +1746,11 @@ class Esi(Base):
         self.debug = debug
         self.images = {}
         self.offset = 0
-        self.catalogs = {}
+        self.catalogs = []
         self.xml_root = None
+        self.xml_device = None
         self.strings = [""]
+        self.strings_index = {"": 0}
         self.preamble = preamble(self)
         self.stdconfig = stdconfig(self)
 
@@ -1615,8 +1758,8 @@ class Esi(Base):
             bindata = self.readeeprom(filename)
             self.binRead(bindata)
         elif filename.endswith(".xml"):
-            xmldata = open(filename, "rb").read()
-            self.xmlRead(xmldata)
+            # parse straight from the file, the raw document is never held
+            self.xmlRead(filename)
 
         elif filename and filename.isnumeric():
             slave_id = filename
@@ -1638,80 +1781,92 @@ class Esi(Base):
         else:
             print(f"UNKNOWN FORMAT: {filename}")
 
+    def xmlParse(self, xmldata):
+        # stream the devices and only keep the content of the selected one,
+        # the others stay as empty elements so Device[n] keeps its position
+        # xmldata is the document itself or a filename / file object
+        if isinstance(xmldata, (bytes, bytearray)):
+            xmldata = io.BytesIO(xmldata)
+        context = etree.iterparse(
+            xmldata,
+            tag="Device",
+            huge_tree=True,
+            collect_ids=False,
+            remove_blank_text=True,
+        )
+        device_num = 0
+        for event, element in context:
+            # only count ./Descriptions/Devices/Device, like the path did
+            ancestors = [ancestor.tag for ancestor in element.iterancestors()]
+            if len(ancestors) != 3 or ancestors[:2] != ["Devices", "Descriptions"]:
+                continue
+            device_num += 1
+            for type_element in element.findall("./Type"):
+                self.deviceids.append(type_element.text)
+            if str(device_num) == str(self.deviceid):
+                self.xml_device = element
+            else:
+                element.clear()
+        return context.root
+
     def xmlRead(self, xmldata):
-        root = etree.fromstring(xmldata)
+        root = self.xmlParse(xmldata)
         self.xml_root = root
 
-        elements = root.findall("./Descriptions/Devices/Device/Type")
-        for element in elements:
-            self.deviceids.append(element.text)
-
         self.preamble.xmlRead(root)
         self.stdconfig.xmlRead(root)
 
-        cat_num = 0
-        self.catalogs = {}
-
-        self.catalogs[cat_num] = strings(self)
-        self.catalogs[cat_num].xmlRead(root)
-        cat_num += 1
+        self.catalogs = []
 
-        self.catalogs[cat_num] = general(self)
-        self.catalogs[cat_num].xmlRead(root)
-        cat_num += 1
+        for cat_class in (strings, general, fmmu, syncm):
+            catalog = cat_class(self)
+            catalog.xmlRead(root)
+            self.catalogs.append(catalog)
 
-        self.catalogs[cat_num] = fmmu(self)
-        self.catalogs[cat_num].xmlRead(root)
-        cat_num += 1
+        for pdo in self.xml_device_children("RxPdo"):
+            catalog = rxpdo(self)
+            catalog.xmlRead(pdo)
+            self.catalogs.append(catalog)
 
-        self.catalogs[cat_num] = syncm(self)
-        self.catalogs[cat_num].xmlRead(root)
-        cat_num += 1
+        for pdo in self.xml_device_children("TxPdo"):
+            catalog = txpdo(self)
+            catalog.xmlRead(pdo)
+            self.catalogs.append(catalog)
 
-        for pdo in root.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/RxPdo"
-        ):
-            self.catalogs[cat_num] = rxpdo(self)
-            self.catalogs[cat_num].xmlRead(pdo)
-            cat_num += 1
-
-        for pdo in root.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/TxPdo"
-        ):
-            self.catalogs[cat_num] = txpdo(self)
-            self.catalogs[cat_num].xmlRead(pdo)
-            cat_num += 1
-
-        for opMode in root.findall(
-            f"./Descriptions/Devices/Device[{self.deviceid}]/Dc/OpMode"
-        ):
-            self.catalogs[cat_num] = dclock(self)
-            self.catalogs[cat_num].xmlRead(opMode)
-            cat_num += 1
+        for Dc in self.xml_device_children("Dc"):
+            for opMode in Dc.iterchildren("OpMode"):
+                catalog = dclock(self)
+                catalog.xmlRead(opMode)
+                self.catalogs.append(catalog)
 
+        Comment = etree.Comment
         elements = root.find("./Vendor")
         for element in elements:
-            if element.tag is etree.Comment:
+            if element.tag is Comment:
                 continue
             if element.tag.startswith("ImageData"):
-                imageData = bytearray.fromhex(element.text)
+                imageData = binascii.a2b_hex(element.text.translate(hex_whitespace))
                 self.images[f"Vendor/{element.tag.replace('ImageData', '')}"] = (
                     imageData
                 )
-                open("/tmp/test.img", "wb").write(imageData)
+                if self.debug:
+                    Path("/tmp/test.img").write_bytes(imageData)
 
-        elements = root.find(f"./Descriptions/Devices/Device[{self.deviceid}]")
+        elements = self.xml_device
         for element in elements:
-            if element.tag is etree.Comment:
+            if element.tag is Comment:
                 continue
             if element.tag.startswith("ImageData"):
-                imageData = bytearray.fromhex(element.text)
+                imageData = binascii.a2b_hex(element.text.translate(hex_whitespace))
                 self.images[f"Device/{element.tag.replace('ImageData', '')}"] = (
                     imageData
                 )
-                open("/tmp/test.img", "wb").write(imageData)
+                if self.debug:
+                    Path("/tmp/test.img").write_bytes(imageData)
 
     def binRead(self, bindata):
+        # catalogs get zero-copy windows into the image
+        bindata = memoryview(bindata)
         self.startpos = 0
         self.offset = 0
         self.offset += self.preamble.binRead(bindata[0 : 0 + self.preamble.size()])
@@ -1721,23 +1876,27 @@ class Esi(Base):
         )
         # read catalogs
         cat_num = 0
-        self.catalogs = {}
+        self.catalogs = []
         self.offset = 128
         while True:
             if self.offset + 4 > len(bindata):
                 break
-            cat_type = self.binVarRead(bindata, 2)
-            cat_name = categorys.get(cat_type)
-            cat_size = self.binVarRead(bindata, 2) * 2
-            if cat_name in cat_mapping:
-                self.catalogs[cat_num] = cat_mapping[cat_name](self)
+            cat_type, cat_words = self.catalog_header.unpack_from(bindata, self.offset)
+            self.offset += self.catalog_header.size
+            cat_size = cat_words * 2
+            cat_class = cat_types.get(cat_type)
+            if cat_class is not None:
+                catalog = cat_class(self)
                 self.startpos = self.offset
-                self.catalogs[cat_num].binRead(
-                    bindata[self.offset : self.offset + cat_size]
-                )
-                if cat_name == "strings":
-                    self.strings = self.catalogs[cat_num].strings
+                catalog.binRead(bindata[self.offset : self.offset + cat_size])
+                self.catalogs.append(catalog)
+                if cat_class is strings:
+                    self.strings = catalog.strings
+                    self.strings_index = {}
+                    for string_index, text in enumerate(self.strings):
+                        self.strings_index.setdefault(text, string_index)
             else:
+                cat_name = categorys.get(cat_type)
                 if cat_type != 65535:  # fill at the end
                     print(
                         "###############################################################"
@@ -1747,19 +1906,18 @@ class Esi(Base):
                         f" Num:{cat_num}, Name:{cat_name}, Type:{cat_type}, Size:{cat_size}"
                     )
                     if cat_size < 100:
-                        print(bindata[self.offset : self.offset + cat_size])
+                        print(bytes(bindata[self.offset : self.offset + cat_size]))
                         print(list(bindata[self.offset : self.offset + cat_size]))
                     print(
                         "###############################################################"
                     )
                     if cat_size < 100:
-                        self.catalogs[cat_num] = unknown_cat(self)
-                        self.catalogs[cat_num].cat_type = cat_type
-                        self.catalogs[cat_num].cat_size = cat_size
+                        catalog = unknown_cat(self)
+                        catalog.cat_type = cat_type
+                        catalog.cat_size = cat_size
                         self.startpos = self.offset
-                        self.catalogs[cat_num].binRead(
-                            bindata[self.offset : self.offset + cat_size]
-                        )
+                        catalog.binRead(bindata[self.offset : self.offset + cat_size])
+                        self.catalogs.append(catalog)
 
             self.offset += cat_size
             cat_num += 1
@@ -1781,23 +1939,16 @@ class Esi(Base):
         etree.SubElement(Device, "Name")
         etree.SubElement(Device, "GroupType")
 
-        categorys_out = {
-            0: "nop",
-            10: "strings",
-            20: "datatypes",
-            40: "fmmu",
-            41: "syncm",
-            51: "rxpdo",
-            50: "txpdo",
-            30: "general",
-            60: "dclock",
-        }
-
-        for ctype in categorys_out:
-            for cat_num, catalog in self.catalogs.items():
-                if catalog.cat_type != ctype:
-                    continue
-                catalog.xmlWrite(root)
+        ordered = sorted(
+            (
+                catalog
+                for catalog in self.catalogs
+                if catalog.cat_type in categorys_xml_order
+            ),
+            key=lambda catalog: categorys_xml_order[catalog.cat_type],
+        )
+        for catalog in ordered:
+            catalog.xmlWrite(root)
 
         self.preamble.xmlWrite(root)
         self.stdconfig.xmlWrite(root)
@@ -1818,19 +1969,19 @@ class Esi(Base):
         output = []
         output += self.preamble.Info(prefix)
         output += self.stdconfig.Info(prefix)
-        for cat_num, catalog in self.catalogs.items():
+        for catalog in self.catalogs:
             output += catalog.Info(prefix)
 
         if self.deviceids:
             output.append(f"{prefix}DeviceId's:")
             for deviceid, name in enumerate(self.deviceids, 1):
                 if str(self.deviceid) == str(deviceid):
-                    output += self.printKeyValue(
-                        "DeviceId", f"{deviceid} ({name}) *", prefix
+                    output.append(
+                        self.printKeyValue("DeviceId", f"{deviceid} ({name}) *", prefix)
                     )
                 else:
-                    output += self.printKeyValue(
-                        "DeviceId", f"{deviceid} ({name})", prefix
+                    output.append(
+                        self.printKeyValue("DeviceId", f"{deviceid} ({name})", prefix)
                     )
         output.append("")
 
@@ -1838,66 +1989,70 @@ class Esi(Base):
             output.append(f"{prefix}Locale Identifiers (LcId's):")
             for lcid in sorted(self.lcids):
                 if self.lcid == lcid:
-                    output += self.printKeyValue(
-                        "LcId", f"{lcid} ({lcidinfo.get(lcid, '')}) *", prefix
+                    output.append(
+                        self.printKeyValue(
+                            "LcId", f"{lcid} ({lcidinfo.get(lcid, '')}) *", prefix
+                        )
                     )
                 else:
-                    output += self.printKeyValue(
-                        "LcId", f"{lcid} ({lcidinfo.get(lcid, '')})", prefix
+                    output.append(
+                        self.printKeyValue(
+                            "LcId", f"{lcid} ({lcidinfo.get(lcid, '')})", prefix
+                        )
                     )
         output.append("")
 
         if self.images:
             output.append(f"{prefix}Images:")
             for name in sorted(self.images):
-                output += self.printKeyValue("Image", f"{name}", prefix)
+                output.append(self.printKeyValue("Image", f"{name}", prefix))
         output.append("")
         return output
 
     def binWrite(self):
-        bindata = []
-        bindata += self.preamble.binWrite()
-        bindata += self.stdconfig.binWrite()
+        parts = [self.preamble.binWrite(), self.stdconfig.binWrite()]
         # use fixed order
-        for ctype in categorys:
-            for cat_num, catalog in self.catalogs.items():
-                if catalog.cat_type != ctype:
-                    continue
-                cat_bindata = catalog.binWrite()
-                cat_size = len(cat_bindata)
-                cat_type = catalog.cat_type
-                # write only filled catalogs
-                if cat_size > 0:
-                    bindata += self.binVarWrite(cat_type, 2)
-                    bindata += self.binVarWrite(cat_size // 2, 2)
-                    bindata += cat_bindata
-
-        bindata += [255, 255]  # fill ???
-        return bytes(bindata)
+        ordered = sorted(
+            (
+                catalog
+                for catalog in self.catalogs
+                if catalog.cat_type in categorys_order
+            ),
+            key=lambda catalog: categorys_order[catalog.cat_type],
+        )
+        for catalog in ordered:
+            cat_bindata = catalog.binWrite()
+            cat_size = len(cat_bindata)
+            # write only filled catalogs
+            if cat_size > 0:
+                parts.append(self.catalog_header.pack(catalog.cat_type, cat_size // 2))
+                parts.append(cat_bindata)
+
+        parts.append(b"\xff\xff")  # fill ???
+        return b"".join(parts)
 
     def readeeprom(self, filename):
-        data = []
         if filename.endswith(".bin"):
-            with open(filename, "rb") as f:
-                data = f.read()
-                return data
-        else:
-            with open(filename, "r") as f:
-                for line in f.readlines():
-                    line = line.strip()
-                    if line and line[0] == ":":
-                        byteCount = int(f"0x{line[1:3]}", 0)
-                        # Address = line[3:7]
-                        # Typ = line[7:9]
-                        # Data = line[9 : 9 + byteCount * 2]
-                        # cSum = line[9 + byteCount * 2 : 9 + byteCount * 2 + 2]
-                        for bn in range(byteCount):
-                            byte = line[9 + (bn * 2) : 9 + (bn * 2) + 2]
-                            byte = int(f"0x{byte}", 0)
-                            data.append(byte)
-                data = bytes(data)
-                return data
-        return None
+            data = Path(filename).read_bytes()
+            return data
+        hexdata = Path(filename).read_bytes()
+        records = hex_record.findall(hexdata)
+        # every ':' line has to match the record pattern
+        lines = sum(
+            1 for line in hexdata.splitlines() if line.lstrip().startswith(b":")
+        )
+        if len(records) != lines:
+            raise ValueError(
+                f"{filename}: {lines - len(records)} malformed Intel-HEX record(s)"
+            )
+        data = bytearray()
+        for record in records:
+            raw = binascii.unhexlify(record)
+            # count, address (2), type, data and checksum, all bytes sum up to 0
+            if len(raw) != raw[0] + 5 or sum(raw) & 0xFF:
+                raise ValueError(f"{filename}: malformed Intel-HEX record")
+            data += raw[4:-1]
+        return bytes(data)
 
 
 def ethercat_slaves():
@@ -1920,7 +2075,7 @@ def ethercat_slaves():
 
 def ethercat_sii_write(slave_id, bindata):
     with tempfile.NamedTemporaryFile() as tmp:
-        open(tmp.name, "wb").write(bindata)
+        Path(tmp.name).write_bytes(bindata)
         cmd = ["ethercat", "sii_write", "-p", slave_id, tmp.name]
         result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         if result.returncode == 0:
@@ -2068,7 +2223,7 @@ if __name__ == "__main__":
     if args.binsave:
         res = esi.binWrite()
         print(f"writing binary data to '{args.binsave}'")
-        open(args.binsave, "wb").write(res)
+        Path(args.binsave).write_bytes(res)
 
     if args.imgsave is not None:
         if not args.binwrite and args.menu:
@@ -2090,7 +2245,7 @@ if __name__ == "__main__":
         else:
             filename = f"{args.imgsave.replace('/', '_')}.bmp"
             print(f"write image to {filename}")
-            open(filename, "wb").write(esi.images[args.imgsave])
+            Path(filename).write_bytes(esi.images[args.imgsave])
 
     if args.binwrite is not None:
         if not args.binwrite and args.menu:
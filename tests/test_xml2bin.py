@@ -1,4 +1,5 @@
 import glob
+from pathlib import Path
 import pytest
 from esitool import Esi
 
@@ -15,17 +16,18 @@ for filename in glob.glob("tests/xml2bin/*.xml"):
 )
 def test_xml2bin(name):
     esi = Esi(f"{name}.xml")
-    expected = open(f"{name}.bin", "rb").read()
+    expected = Path(f"{name}.bin").read_bytes()
 
     bindata = esi.binWrite()
 
-    if list(expected) == list(bindata):
+    if expected == bindata:
         print("------- OK -------")
-    for pos in range(len(expected)):
-        if expected[pos] != bindata[pos]:
-            print(f"{pos} {expected[pos]:8d} {bindata[pos]:8d}")
+    else:
+        for pos, (want, got) in enumerate(zip(expected, bindata)):
+            if want != got:
+                print(f"{pos} {want:8d} {got:8d}")
 
-    assert list(expected) == list(bindata)
+    assert expected == bindata
 
 
 @pytest.mark.parametrize(
@@ -36,9 +38,9 @@ def test_bin2xml(name):
     esi = Esi(f"{name}.bin")
     xmldata = esi.xmlWrite().strip()
     if not glob.glob(f"{name.replace('xml2bin', 'bin2xml')}.xml"):
-        open(f"{name.replace('xml2bin', 'bin2xml')}.xml", "w").write(xmldata)
+        Path(f"{name.replace('xml2bin', 'bin2xml')}.xml").write_text(xmldata)
 
-    expected = open(f"{name.replace('xml2bin', 'bin2xml')}.xml", "r").read().strip()
+    expected = Path(f"{name.replace('xml2bin', 'bin2xml')}.xml").read_text().strip()
 
     assert expected == xmldata
 
@@ -71,12 +73,50 @@ def test_bin2xml(name):
 def test_xml2bin_options(name, deviceid, lcid):
     esi = Esi(f"{name}.xml", lcid=lcid, deviceid=deviceid)
     bindata = esi.binWrite()
-    open(f"{name}_{deviceid}_{lcid}.bin", "wb").write(bindata)
-    expected = open(f"{name}_{deviceid}_{lcid}.bin", "rb").read()
-    if list(expected) == list(bindata):
+    Path(f"{name}_{deviceid}_{lcid}.bin").write_bytes(bindata)
+    expected = Path(f"{name}_{deviceid}_{lcid}.bin").read_bytes()
+    if expected == bindata:
         print("------- OK -------")
-    for pos in range(len(expected)):
-        if expected[pos] != bindata[pos]:
-            print(f"{pos} {expected[pos]:8d} {bindata[pos]:8d}")
+    else:
+        for pos, (want, got) in enumerate(zip(expected, bindata)):
+            if want != got:
+                print(f"{pos} {want:8d} {got:8d}")
 
-    assert list(expected) == list(bindata)
+    assert expected == bindata
+
+
+def hex_records(bindata):
+    records = []
+    for offset in range(0, len(bindata), 16):
+        chunk = bindata[offset : offset + 16]
+        record = bytes((len(chunk), offset >> 8, offset & 0xFF, 0)) + chunk
+        record += bytes(((-sum(record)) & 0xFF,))
+        records.append(f":{record.hex().upper()}")
+    records.append(":00000001FF")
+    return records
+
+
+def test_hex2bin(tmp_path):
+    expected = Path("tests/xml2bin/Beckhoff_EK11xx.bin").read_bytes()
+    hexfile = tmp_path / "eeprom.hex"
+    hexfile.write_text("\n".join(hex_records(expected)) + "\n")
+
+    assert Esi.readeeprom(None, str(hexfile)) == expected
+
+
+@pytest.mark.parametrize(
+    "damage",
+    [
+        lambda record: record[:-8] + record[-2:],  # data digits missing
+        lambda record: record[:-2] + f"{(int(record[-2:], 16) + 1) & 0xFF:02X}",
+        lambda record: record + "zz",
+    ],
+)
+def test_hex_malformed_record(tmp_path, damage):
+    records = hex_records(Path("tests/xml2bin/Beckhoff_EK11xx.bin").read_bytes())
+    records[3] = damage(records[3])
+    hexfile = tmp_path / "eeprom.hex"
+    hexfile.write_text("\n".join(records) + "\n")
+
+    with pytest.raises(ValueError):
+        Esi.readeeprom(None, str(hexfile))